@@ -0,0 +1,22 @@
+"""
+Shared .env loader for the scripts and the test runner
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+
+ENV_FILE = Path(__file__).parent.parent / ".env"
+
+
+@lru_cache(maxsize=1)
+def load_env() -> None:
+    """Load environment variables from .env file in project root (parsed once per interpreter)"""
+    if ENV_FILE.exists():
+        for line in ENV_FILE.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            # Skip comments and empty lines
+            if line and not line.startswith("#"):
+                if "=" in line:
+                    key, value = line.split("=", 1)
+                    os.environ[key.strip()] = value.strip()
@@ -6,7 +6,6 @@ Create an OpenAI Assistant for RTF conversion testing
 import os
 import sys
 import json
-from pathlib import Path
 
 # Fix encoding for Windows
 if sys.stdout.encoding != 'utf-8':
@@ -14,20 +13,9 @@ if sys.stdout.encoding != 'utf-8':
 
 from openai import OpenAI
 
-# Load .env file
-def load_env_file():
-    """Load environment variables from .env file"""
-    env_file = Path(__file__).parent.parent / ".env"
-    if env_file.exists():
-        with open(env_file) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    if "=" in line:
-                        key, value = line.split("=", 1)
-                        os.environ[key.strip()] = value.strip()
-
-load_env_file()
+from _env import ENV_FILE, load_env
+
+load_env()
 
 API_KEY = os.getenv("OPENAI_API_KEY")
 
@@ -78,13 +66,10 @@ def create_assistant():
 
 def save_assistant_id(assistant_id):
     """Save assistant ID to .env file"""
-    env_file = Path(__file__).parent.parent / ".env"
-
     # Read existing content
     content = ""
-    if env_file.exists():
-        with open(env_file) as f:
-            content = f.read()
+    if ENV_FILE.exists():
+        content = ENV_FILE.read_text(encoding="utf-8")
 
     # Remove existing OPENAI_ASSISTANT_ID if present
     lines = content.split("\n")
@@ -95,8 +80,7 @@ def save_assistant_id(assistant_id):
     content += f"OPENAI_ASSISTANT_ID={assistant_id}\n"
 
     # Write back
-    with open(env_file, "w") as f:
-        f.write(content)
+    ENV_FILE.write_text(content, encoding="utf-8")
 
     print(f"\n💾 Assistant ID saved to .env")
 
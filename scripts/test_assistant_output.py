@@ -5,32 +5,21 @@ Test the Assistant output directly
 
 import os
 import sys
-import time
-from pathlib import Path
+import asyncio
 
 if sys.stdout.encoding != 'utf-8':
     sys.stdout.reconfigure(encoding='utf-8')
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 
-def load_env_file():
-    """Load environment variables from .env file"""
-    env_file = Path(__file__).parent.parent / ".env"
-    if env_file.exists():
-        with open(env_file) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    if "=" in line:
-                        key, value = line.split("=", 1)
-                        os.environ[key.strip()] = value.strip()
+from _env import load_env
 
-load_env_file()
+load_env()
 
 API_KEY = os.getenv("OPENAI_API_KEY")
 ASSISTANT_ID = os.getenv("OPENAI_ASSISTANT_ID")
 
-client = OpenAI(api_key=API_KEY)
+client = AsyncOpenAI(api_key=API_KEY)
 
 # Test prompt
 TEST_PROMPT = """Convertir le texte suivant en document RTF structuré avec titre, sections et formatage:
@@ -42,24 +31,24 @@ TEST_PROMPT = """Convertir le texte suivant en document RTF structuré avec titr
 - Déploiement en production
 - Réduction de la dette technique"""
 
-def test_assistant():
+async def test_assistant():
     print("[INFO] Testing Assistant with sample input...")
     print(f"[INFO] Prompt: {TEST_PROMPT[:100]}...")
     print()
 
     # Create thread
-    thread = client.beta.threads.create()
+    thread = await client.beta.threads.create()
     print(f"[OK] Thread created: {thread.id}")
 
     # Add message
-    client.beta.threads.messages.create(
+    await client.beta.threads.messages.create(
         thread_id=thread.id,
         role="user",
         content=TEST_PROMPT
     )
 
     # Run assistant
-    run = client.beta.threads.runs.create(
+    run = await client.beta.threads.runs.create(
         thread_id=thread.id,
         assistant_id=ASSISTANT_ID
     )
@@ -67,27 +56,30 @@ def test_assistant():
 
     # Wait for completion
     while run.status in ["queued", "in_progress"]:
-        time.sleep(0.5)
-        run = client.beta.threads.runs.retrieve(thread_id=thread.id, run_id=run.id)
+        await asyncio.sleep(0.5)
+        run = await client.beta.threads.runs.retrieve(thread_id=thread.id, run_id=run.id)
         print(f"[...] Status: {run.status}")
 
     print(f"[OK] Run completed with status: {run.status}")
 
-    # Get response
-    messages = client.beta.threads.messages.list(thread_id=thread.id)
+    # Get response (newest message only)
+    messages = await client.beta.threads.messages.list(
+        thread_id=thread.id, order="desc", limit=1
+    )
 
     print("\n" + "="*60)
     print("ASSISTANT RESPONSE:")
     print("="*60)
 
-    for msg in messages.data:
-        if msg.role == "assistant":
-            content = str(msg.content[0].text)
-            print(content)
-            print("\n" + "="*60)
-            print("RESPONSE LENGTH:", len(content))
-            print("STARTS WITH {\\rtf:", content.strip().startswith("{\\rtf"))
-            print("="*60)
+    msg = messages.data[0]
+    assert msg.role == "assistant", f"Unexpected last message role: {msg.role}"
+
+    content = str(msg.content[0].text)
+    print(content)
+    print("\n" + "="*60)
+    print("RESPONSE LENGTH:", len(content))
+    print("STARTS WITH {\\rtf:", content.strip().startswith("{\\rtf"))
+    print("="*60)
 
 if __name__ == "__main__":
-    test_assistant()
+    asyncio.run(test_assistant())
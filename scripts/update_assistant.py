@@ -5,7 +5,6 @@ Update an OpenAI Assistant's system prompt
 
 import os
 import sys
-from pathlib import Path
 
 # Fix encoding
 if sys.stdout.encoding != 'utf-8':
@@ -13,19 +12,9 @@ if sys.stdout.encoding != 'utf-8':
 
 from openai import OpenAI
 
-def load_env_file():
-    """Load environment variables from .env file"""
-    env_file = Path(__file__).parent.parent / ".env"
-    if env_file.exists():
-        with open(env_file) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    if "=" in line:
-                        key, value = line.split("=", 1)
-                        os.environ[key.strip()] = value.strip()
-
-load_env_file()
+from _env import load_env
+
+load_env()
 
 API_KEY = os.getenv("OPENAI_API_KEY")
 ASSISTANT_ID = os.getenv("OPENAI_ASSISTANT_ID")
@@ -0,0 +1,118 @@
+"""
+Pytest fixtures and hooks for the Custom GPT RTF converter tests
+"""
+
+import json
+from datetime import datetime
+from typing import Dict
+
+import pytest
+
+try:
+    import orjson  # Optional: faster report serialization
+except ImportError:
+    orjson = None
+
+from test_runner import (
+    EXPECTED_DIR,
+    INPUT_DIR,
+    MODEL_ID,
+    OUTPUT_DIR,
+    SPECIAL_CHARACTERS_PROMPT,
+    GoldenSample,
+    NormalizedText,
+    ResponseCache,
+    RTFValidator,
+    TextNormalizer,
+)
+
+
+@pytest.fixture(scope="session")
+def input_texts() -> Dict[str, str]:
+    """Sample prompts by sample name, read once per session"""
+    return {
+        path.stem: path.read_text(encoding="utf-8")
+        for path in sorted(INPUT_DIR.glob("*.txt"))
+    }
+
+
+@pytest.fixture(scope="session")
+def expected_rtf() -> Dict[str, str]:
+    """Expected RTF documents by sample name, read once per session"""
+    return {
+        path.name[: -len("_expected.rtf")]: path.read_text(encoding="utf-8")
+        for path in sorted(EXPECTED_DIR.glob("*_expected.rtf"))
+    }
+
+
+@pytest.fixture(scope="session")
+def expected_texts(expected_rtf) -> Dict[str, NormalizedText]:
+    """Visible text of each expected RTF by sample name, extracted and normalized once per session"""
+    return {
+        name: TextNormalizer.prepare(RTFValidator.extract_visible_text(rtf))
+        for name, rtf in expected_rtf.items()
+    }
+
+
+@pytest.fixture(scope="session")
+def gpt_response(request, input_texts, tmp_path_factory) -> ResponseCache:
+    """
+    Memoized Assistant calls: gpt_response(prompt) hits the API once per unique prompt.
+    Every prompt the suite is known to use is prefetched in one concurrent batch.
+    Under pytest-xdist the first worker runs the batch and the others load its results.
+    """
+    cache = ResponseCache()
+    prompts = dict(input_texts)
+    prompts["special_characters"] = SPECIAL_CHARACTERS_PROMPT
+
+    if not hasattr(request.config, "workerinput"):
+        cache.prefetch(prompts, save=input_texts.keys())
+        return cache
+
+    # Temp directory shared by all workers of this run
+    shared = tmp_path_factory.getbasetemp().parent / "gpt_responses.json"
+    cache.prefetch_shared(prompts, shared, save=input_texts.keys())
+    return cache
+
+
+@pytest.fixture(scope="session")
+def sample(request, input_texts, expected_rtf, expected_texts, gpt_response) -> GoldenSample:
+    """
+    Indirectly parametrized golden sample: request.param is the sample name.
+    One instance per sample for the whole session, so its tests share the response and visible text.
+    """
+    name = request.param
+    return GoldenSample(
+        name, input_texts[name], expected_rtf[name], expected_texts[name], gpt_response
+    )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write the test report to OUTPUT_DIR/report.json once the session is over"""
+    # Under pytest-xdist only the controller writes the report
+    if hasattr(session.config, "workerinput"):
+        return
+
+    reporter = session.config.pluginmanager.get_plugin("terminalreporter")
+    stats = reporter.stats if reporter else {}
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "model_id": MODEL_ID,
+        "tests_run": session.testscollected,
+        "results": {
+            outcome: len(reports)
+            for outcome, reports in stats.items()
+            if outcome in ("passed", "failed", "error", "skipped")
+        },
+        "exit_status": int(exitstatus),
+    }
+
+    (OUTPUT_DIR / "report.json").write_bytes(_dump_report(report))
+
+
+def _dump_report(report: dict) -> bytes:
+    """Serialize the report as indented UTF-8 JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2)
+    return json.dumps(report, indent=2, ensure_ascii=False).encode("utf-8")
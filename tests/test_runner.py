@@ -7,26 +7,25 @@ import os
 import sys
 import re
 import json
-import requests
+import asyncio
+import hashlib
+import unicodedata
 import pytest
+from collections import Counter
+from functools import cached_property
+from itertools import accumulate
 from pathlib import Path
-from typing import Tuple
-
-# Load .env file if it exists
-def load_env_file():
-    """Load environment variables from .env file in project root"""
-    env_file = Path(__file__).parent.parent / ".env"
-    if env_file.exists():
-        with open(env_file) as f:
-            for line in f:
-                line = line.strip()
-                # Skip comments and empty lines
-                if line and not line.startswith("#"):
-                    if "=" in line:
-                        key, value = line.split("=", 1)
-                        os.environ[key.strip()] = value.strip()
-
-load_env_file()
+from types import SimpleNamespace
+from typing import Dict, Iterable, NamedTuple, Tuple, Union
+from tenacity import (
+    retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter, wait_none
+)
+
+# Load .env file if it exists (shared, parsed-once loader in scripts/_env.py)
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from _env import load_env
+
+load_env()
 
 # Configuration
 API_KEY = os.getenv("OPENAI_API_KEY")
@@ -36,6 +35,51 @@ INPUT_DIR = TEST_DIR / "input"
 EXPECTED_DIR = TEST_DIR / "expected"
 OUTPUT_DIR = TEST_DIR / "output"
 
+SPECIAL_CHARACTERS_PROMPT = "Convertir en RTF: Café, naïve, £500, © 2025"
+CONSISTENCY_RUNS = 2
+
+# Timeout budget (seconds) for one Assistant call: thread, message and streamed run, retries included.
+# It is the only overall limit; the HTTP client only bounds connecting, so a dead host is retried quickly.
+CALL_TIMEOUT = 60
+CONNECT_TIMEOUT = 10.0
+
+# Transient API failures worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 529}
+RETRY_ATTEMPTS = 5
+RETRY_MAX_WAIT = 8  # seconds between attempts, well inside CALL_TIMEOUT
+
+# Maximum number of Assistant runs in flight at once
+# (at least 1: a zero-sized semaphore would block every call forever, before CALL_TIMEOUT starts)
+MAX_CONCURRENCY = max(1, int(os.getenv("OPENAI_MAX_CONCURRENCY", "16")))
+# Each in-flight run makes one request at a time, so the pool is sized to match
+MAX_CONNECTIONS = MAX_CONCURRENCY
+
+# RTF and text patterns, compiled once
+# Escaped characters: \'hh (code page 1252 byte) and \uN (Unicode). The ANSI fallback after \uN is
+# consumed only when it is "?" or \'hh: under \uc0 the next character is real text.
+_RTF_ESCAPE = re.compile(r"\\(?:'([0-9a-fA-F]{2})|u(-?\d+) ?(?:\\'[0-9a-fA-F]{2}|\?)?)")
+_RTF_CTRL = re.compile(r"\\[a-z]+-?[0-9]*\s?")  # control words (with signed parameter)
+# Kept as a separate pass: in an alternation the literal "\" prefix scan is lost, which is slower
+_BRACES = re.compile(r"[{}]")
+_WS = re.compile(r"\s+")
+_WORD = re.compile(r"\S+")
+
+# Brace scanning on bytes: every byte except { and } is deleted in C by bytes.translate
+_NON_BRACE_BYTES = bytes(b for b in range(256) if b not in b"{}")
+_BRACE_DELTA = {ord("{"): 1, ord("}"): -1}
+_RTF_HEADER = b"{\\rtf"
+_CHARSET_MARKERS = (b"\\ansi", b"\\mac", b"\\pc")
+
+# Typographic dashes and quotes folded to their ASCII forms
+_PUNCT_TABLE = str.maketrans({
+    "\u2014": "-",  # em dash
+    "\u2013": "-",  # en dash
+    "\u201c": '"',  # left double quote
+    "\u201d": '"',  # right double quote
+    "\u2018": "'",  # left single quote
+    "\u2019": "'",  # right single quote
+})
+
 # Create output directory if it doesn't exist
 OUTPUT_DIR.mkdir(exist_ok=True)
 
@@ -44,36 +88,39 @@ class RTFValidator:
     """Validates RTF format integrity"""
 
     @staticmethod
-    def is_valid_rtf(content: str) -> Tuple[bool, str]:
+    def is_valid_rtf(content: Union[str, bytes]) -> Tuple[bool, str]:
         """
         Check if content is valid RTF
         Returns: (is_valid, error_message)
         """
-        if not content.strip():
+        # RTF markup is ASCII, so every check runs on one byte per character
+        buf = content.encode("utf-8") if isinstance(content, str) else content
+
+        stripped = buf.strip()
+        if not stripped:
             return False, "Empty content"
 
         # Basic RTF structure checks
-        if not content.strip().startswith("{\\rtf"):
+        if not stripped.startswith(_RTF_HEADER):
             return False, "Missing RTF header {\\rtf"
 
-        if not content.strip().endswith("}"):
+        if not stripped.endswith(b"}"):
             return False, "Missing closing brace }"
 
-        # Check for balanced braces
-        brace_count = 0
-        for char in content:
-            if char == "{":
-                brace_count += 1
-            elif char == "}":
-                brace_count -= 1
-            if brace_count < 0:
-                return False, "Unbalanced braces (more closing than opening)"
+        # One C-level pass keeps only the braces; both brace checks then run on that short string
+        braces = buf.translate(None, _NON_BRACE_BYTES)
 
+        # Check for balanced braces
+        brace_count = 2 * braces.count(b"{") - len(braces)
         if brace_count != 0:
             return False, f"Unbalanced braces (difference: {brace_count})"
 
+        # Running balance over the braces must never drop below zero
+        if min(accumulate(map(_BRACE_DELTA.__getitem__, braces)), default=0) < 0:
+            return False, "Unbalanced braces (more closing than opening)"
+
         # Check for essential RTF elements
-        if "\\ansi" not in content and "\\mac" not in content and "\\pc" not in content:
+        if not any(marker in buf for marker in _CHARSET_MARKERS):
             return False, "Missing character set declaration"
 
         return True, "Valid RTF"
@@ -81,13 +128,97 @@ class RTFValidator:
     @staticmethod
     def extract_visible_text(rtf_content: str) -> str:
         """Extract visible text from RTF, removing formatting commands"""
+        # Decode escaped characters first, so they are not stripped as control words
+        text = rtf_content
+        if "\\'" in text or "\\u" in text:
+            text = _RTF_ESCAPE.sub(_decode_escape, text)
         # Remove RTF control sequences but keep text content
-        text = re.sub(r"\\[a-z0-9]+\d*\s?", " ", rtf_content)
+        text = _RTF_CTRL.sub(" ", text)
         # Remove braces
-        text = re.sub(r"[{}]", " ", text)
+        text = _BRACES.sub(" ", text)
         # Remove special characters and extra spaces
-        text = re.sub(r"\s+", " ", text).strip()
-        return text
+        return _WS.sub(" ", text).strip()
+
+
+def _decode_escape(match: "re.Match") -> str:
+    """Character encoded by one _RTF_ESCAPE match"""
+    hex_byte, code_point = match.groups()
+    if hex_byte:
+        return bytes.fromhex(hex_byte).decode("cp1252", errors="replace")
+    # RTF writes code points above 32767 as negative 16-bit values
+    return chr(int(code_point) % 0x10000)
+
+
+class IncrementalRTFValidator:
+    """
+    Runs the RTFValidator.is_valid_rtf checks on RTF fed chunk by chunk,
+    so a streamed reply is validated as it arrives instead of in a second pass
+    """
+
+    # Bytes kept between chunks so a marker split across two chunks is still seen
+    _OVERLAP = max(len(marker) for marker in _CHARSET_MARKERS) - 1
+
+    def __init__(self):
+        self.balance = 0
+        self.min_balance = 0
+        self.charset_seen = False
+        self._head = b""  # leading bytes, until the header can be checked
+        self._header_ok = None
+        self._tail = b""
+        self._last = b""  # last non-whitespace byte seen
+
+    def feed(self, chunk: Union[str, bytes]) -> None:
+        """Account for the next chunk of RTF"""
+        buf = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+        if not buf:
+            return
+
+        if self._header_ok is None:
+            self._head += buf
+            head = self._head.lstrip()
+            if len(head) >= len(_RTF_HEADER):
+                self._header_ok = head.startswith(_RTF_HEADER)
+                self._head = b""
+
+        braces = buf.translate(None, _NON_BRACE_BYTES)
+        if braces:
+            running = accumulate(map(_BRACE_DELTA.__getitem__, braces), initial=self.balance)
+            self.min_balance = min(self.min_balance, min(running))
+            self.balance += 2 * braces.count(b"{") - len(braces)
+
+        if not self.charset_seen:
+            window = self._tail + buf[: self._OVERLAP]
+            self.charset_seen = any(
+                marker in buf or marker in window for marker in _CHARSET_MARKERS
+            )
+        self._tail = (self._tail + buf)[-self._OVERLAP:]
+
+        self._last = buf.rstrip()[-1:] or self._last
+
+    def finalize(self) -> Tuple[bool, str]:
+        """Same result as RTFValidator.is_valid_rtf on the concatenated chunks"""
+        if not self._last:
+            return False, "Empty content"
+
+        header_ok = self._header_ok
+        if header_ok is None:
+            header_ok = self._head.lstrip().startswith(_RTF_HEADER)
+        if not header_ok:
+            return False, "Missing RTF header {\\rtf"
+
+        if self._last != b"}":
+            return False, "Missing closing brace }"
+
+        if self.balance != 0:
+            return False, f"Unbalanced braces (difference: {self.balance})"
+
+        if self.min_balance < 0:
+            return False, "Unbalanced braces (more closing than opening)"
+
+        if not self.charset_seen:
+            return False, "Missing character set declaration"
+
+        return True, "Valid RTF"
 
 
 class CustomGPTTester:
@@ -96,70 +227,265 @@ class CustomGPTTester:
     @staticmethod
     def call_custom_gpt(prompt: str) -> str:
         """Send prompt to Assistant and return response"""
-        if not API_KEY:
-            raise ValueError("OPENAI_API_KEY environment variable not set")
+        output, _ = CustomGPTTester.call_and_validate(prompt)
+        return output
 
-        if not MODEL_ID:
-            raise ValueError("OPENAI_ASSISTANT_ID environment variable not set")
-
-        try:
-            from openai import OpenAI
+    @staticmethod
+    def call_and_validate(prompt: str) -> Tuple[str, Tuple[bool, str]]:
+        """Send prompt to Assistant and return (response, RTF validation result)"""
 
-            client = OpenAI(api_key=API_KEY)
+        async def call() -> Tuple[str, Tuple[bool, str]]:
+            async with _create_async_client() as client:
+                return await CustomGPTTester._call_and_validate_async(client, prompt)
 
-            # Create a thread
-            thread = client.beta.threads.create()
+        return asyncio.run(call())
 
-            # Add message to thread
-            client.beta.threads.messages.create(
-                thread_id=thread.id, role="user", content=prompt
+    @staticmethod
+    async def _call_and_validate_async(client, prompt: str) -> Tuple[str, Tuple[bool, str]]:
+        """
+        Send prompt to Assistant and return (response, RTF validation result),
+        the RTF being validated chunk by chunk while the response streams in
+        client: AsyncOpenAI client from _create_async_client, owned (and closed) by the caller
+        """
+        try:
+            return await asyncio.wait_for(
+                _run_assistant(client, prompt), CALL_TIMEOUT
             )
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"API call failed: Assistant call timed out after {CALL_TIMEOUT}s")
+        except Exception as e:
+            raise RuntimeError(f"API call failed: {str(e)}")
 
-            # Run the assistant
-            run = client.beta.threads.runs.create(
-                thread_id=thread.id, assistant_id=MODEL_ID
+    @staticmethod
+    async def _gather_custom_gpt_async(
+        prompts: Dict[str, str], save: Iterable[str] = ()
+    ) -> Dict[str, object]:
+        """
+        Run all prompts concurrently, at most MAX_CONCURRENCY at a time
+        Returns (response, RTF validation result) by name, or the exception a call raised
+        save: names whose output is written to OUTPUT_DIR as soon as it arrives
+        """
+        try:
+            client = _create_async_client()
+        except ValueError as e:
+            # Missing configuration fails every call the same way
+            return dict.fromkeys(prompts, e)
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        save = set(save)
+
+        async def call(name: str, prompt: str) -> Tuple[str, Tuple[bool, str]]:
+            async with semaphore:
+                output, rtf_check = await CustomGPTTester._call_and_validate_async(client, prompt)
+            if name in save:
+                # Disk I/O runs in a worker thread while other calls are in flight
+                await asyncio.to_thread(_save_output, name, output)
+            return output, rtf_check
+
+        # One client (and connection pool) for the whole batch, closed once it is done
+        async with client:
+            results = await asyncio.gather(
+                *(call(name, prompt) for name, prompt in prompts.items()),
+                return_exceptions=True,
             )
+        return dict(zip(prompts, results))
 
-            # Wait for completion (with timeout)
-            import time
 
-            timeout = 60
-            start_time = time.time()
-            while run.status in ["queued", "in_progress"]:
-                if time.time() - start_time > timeout:
-                    raise TimeoutError(f"Assistant run timed out after {timeout}s")
+class ResponseCache:
+    """
+    Assistant responses memoized by prompt hash, so each unique prompt hits the API once.
+    A failed call is remembered too, and re-raised by every lookup of that prompt.
+    """
 
-                time.sleep(0.5)
-                run = client.beta.threads.runs.retrieve(thread_id=thread.id, run_id=run.id)
+    def __init__(self):
+        self._results = {}
 
-            if run.status != "completed":
-                raise RuntimeError(f"Assistant run failed with status: {run.status}")
+    @staticmethod
+    def _key(prompt: str) -> str:
+        return hashlib.sha1(prompt.encode("utf-8")).hexdigest()
 
-            # Get messages
-            messages = client.beta.threads.messages.list(thread_id=thread.id)
+    def prefetch(self, prompts: Dict[str, str], save: Iterable[str] = ()) -> None:
+        """
+        Fetch every prompt not cached yet in one concurrent batch
+        save: names whose output is written to OUTPUT_DIR
+        """
+        missing = {}
+        for name, prompt in prompts.items():
+            if self._key(prompt) not in self._results:
+                missing.setdefault(self._key(prompt), (name, prompt))
+        batch = dict(missing.values())
+
+        results = asyncio.run(CustomGPTTester._gather_custom_gpt_async(batch, save=save))
+        for name, result in results.items():
+            self._results[self._key(batch[name])] = result
+
+    def prefetch_shared(
+        self, prompts: Dict[str, str], path: Path, save: Iterable[str] = ()
+    ) -> None:
+        """
+        prefetch, shared between processes through a JSON file at path: the first process
+        to take the lock fetches and dumps the results, the others load them
+        """
+        from filelock import FileLock
+
+        with FileLock(f"{path}.lock"):
+            if path.is_file():
+                self.load(path)
+            else:
+                self.prefetch(prompts, save=save)
+                self.dump(path)
+
+    def dump(self, path: Path) -> None:
+        """Write cached results to a JSON file, so other processes can load them"""
+        data = {
+            key: {"error": str(result)} if isinstance(result, BaseException)
+            else {"output": result[0], "rtf_check": result[1]}
+            for key, result in self._results.items()
+        }
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    def load(self, path: Path) -> None:
+        """Add results written by dump; a failed call is restored as a RuntimeError"""
+        for key, entry in json.loads(path.read_text(encoding="utf-8")).items():
+            if "error" in entry:
+                self._results[key] = RuntimeError(entry["error"])
+            else:
+                self._results[key] = entry["output"], tuple(entry["rtf_check"])
+
+    def _result(self, prompt: str, force: bool = False) -> Tuple[str, Tuple[bool, str]]:
+        if force:
+            # Fresh call, neither read from nor stored in the cache
+            return CustomGPTTester.call_and_validate(prompt)
+
+        key = self._key(prompt)
+        if key not in self._results:
+            try:
+                self._results[key] = CustomGPTTester.call_and_validate(prompt)
+            except Exception as e:
+                self._results[key] = e
+
+        result = self._results[key]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def __call__(self, prompt: str, force: bool = False) -> str:
+        """Assistant response to prompt; force=True makes a fresh call that bypasses the cache"""
+        return self._result(prompt, force)[0]
+
+    def rtf_check(self, prompt: str, force: bool = False) -> Tuple[bool, str]:
+        """RTF validation result for the response to prompt, computed while it streamed in"""
+        return self._result(prompt, force)[1]
+
+
+def _save_output(sample: str, output: str) -> None:
+    """Save output for inspection, atomically so an interrupted run leaves no partial file"""
+    path = OUTPUT_DIR / f"{sample}_output.rtf"
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(output, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _create_async_client():
+    """
+    Create an AsyncOpenAI client with its own connection pool.
+    Use it as an async context manager, so the pool is closed on the loop that opened it.
+    """
+    if not API_KEY:
+        raise ValueError("OPENAI_API_KEY environment variable not set")
+
+    if not MODEL_ID:
+        raise ValueError("OPENAI_ASSISTANT_ID environment variable not set")
+
+    import httpx
+    from openai import AsyncOpenAI
+
+    # SDK retries are disabled: _run_assistant owns retrying.
+    # HTTP/2 multiplexes concurrent runs over the same TLS connection.
+    return AsyncOpenAI(
+        api_key=API_KEY,
+        timeout=httpx.Timeout(None, connect=CONNECT_TIMEOUT),
+        max_retries=0,
+        http_client=httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_CONNECTIONS,
+            ),
+        ),
+    )
 
-            # Return the last assistant message
-            for msg in messages.data:
-                if msg.role == "assistant":
-                    content_block = msg.content[0]
-                    # TextContentBlock has a .text attribute which is a Text object
-                    # Text object has a .value attribute with the actual content
-                    if hasattr(content_block, 'text'):
-                        text_obj = content_block.text
-                        if hasattr(text_obj, 'value'):
-                            return text_obj.value
 
-                    # Fallback: try direct access
-                    if hasattr(content_block, 'value'):
-                        return content_block.value
+def _is_transient(error: BaseException) -> bool:
+    """Timeouts, dropped connections, stream errors and 429/5xx responses are retried; anything else is not"""
+    import httpx
+    from openai import APIConnectionError, APIError, APIStatusError
 
-                    # Last resort: stringify
-                    return str(content_block)
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRY_STATUS_CODES
+    # APITimeoutError is a subclass of APIConnectionError; a stream dropped partway
+    # raises httpx's own TransportError (ReadError, RemoteProtocolError, ...)
+    if isinstance(error, (APIConnectionError, httpx.TransportError)):
+        return True
+    # An error event sent inside the stream surfaces as a bare APIError
+    return type(error) is APIError
+
+
+_api_retry = retry(
+    retry=retry_if_exception(_is_transient),
+    wait=wait_exponential_jitter(initial=1, max=RETRY_MAX_WAIT),
+    stop=stop_after_attempt(RETRY_ATTEMPTS),
+    reraise=True,
+)
+
+
+@_api_retry
+async def _run_assistant(client, prompt: str) -> Tuple[str, Tuple[bool, str]]:
+    """
+    Body of CustomGPTTester._call_and_validate_async, bounded there by CALL_TIMEOUT.
+    Transient failures retry the whole attempt on a new thread: a dropped stream may leave
+    its run active server-side, and a thread accepts only one active run.
+    """
+    # Create a thread
+    thread = await client.beta.threads.create()
+
+    # Add message to thread
+    await client.beta.threads.messages.create(
+        thread_id=thread.id, role="user", content=prompt
+    )
 
-            raise RuntimeError("No response from assistant")
+    # Run the assistant, streaming its reply instead of polling for it
+    run, output, rtf_check = await _stream_run(client, thread.id)
 
-        except Exception as e:
-            raise RuntimeError(f"API call failed: {str(e)}")
+    if run.status != "completed":
+        raise RuntimeError(f"Assistant run failed with status: {run.status}")
+
+    if not output:
+        raise RuntimeError("No response from assistant")
+
+    return output, rtf_check
+
+
+async def _stream_run(client, thread_id: str):
+    """Run the assistant on a thread and return (final run, reply text, RTF validation result)"""
+    chunks = []
+    validator = IncrementalRTFValidator()
+    async with client.beta.threads.runs.stream(
+        thread_id=thread_id, assistant_id=MODEL_ID
+    ) as stream:
+        async for text in stream.text_deltas:
+            chunks.append(text)
+            validator.feed(text)
+        run = await stream.get_final_run()
+    return run, "".join(chunks), validator.finalize()
+
+
+class NormalizedText(NamedTuple):
+    """Normalized text and its word counts, prepared once for repeated comparisons"""
+
+    text: str
+    words: Counter
+    total: int
 
 
 class TextNormalizer:
@@ -169,52 +495,102 @@ class TextNormalizer:
     def normalize(text: str) -> str:
         """
         Normalize text by:
+        - Folding Unicode variants (NFKC: composed accents, no-break spaces, ligatures, ellipsis)
+        - Removing common punctuation variations
         - Converting to lowercase
         - Removing extra whitespace
-        - Removing common punctuation variations
         """
-        # Convert to lowercase
-        text = text.lower()
-        # Remove extra whitespace
-        text = re.sub(r"\s+", " ", text).strip()
-        # Normalize dashes and quotes
-        text = text.replace("—", "-").replace("–", "-")
-        text = text.replace(""", '"').replace(""", '"')
-        text = text.replace("'", "'").replace("'", "'")
-        return text
+        # Fold Unicode variants, then dashes and quotes in a single pass
+        text = unicodedata.normalize("NFKC", text).translate(_PUNCT_TABLE)
+        # Convert to lowercase and remove extra whitespace
+        return _WS.sub(" ", text.lower()).strip()
+
+    @staticmethod
+    def prepare(text: str) -> NormalizedText:
+        """Normalize and tokenize a reference text once, for use as `expected`"""
+        norm_text = TextNormalizer.normalize(text)
+        words = Counter(norm_text.split())
+        return NormalizedText(norm_text, words, sum(words.values()))
 
     @staticmethod
-    def assert_normalized_equal(actual: str, expected: str, tolerance: float = 0.85):
+    def assert_normalized_equal(
+        actual: str, expected: Union[str, NormalizedText], tolerance: float = 0.85
+    ):
         """
         Compare two texts with tolerance for minor differences
+        expected: raw text, or the output of TextNormalizer.prepare
         tolerance: minimum similarity ratio (0-1)
         """
+        if isinstance(expected, str):
+            expected = TextNormalizer.prepare(expected)
         norm_actual = TextNormalizer.normalize(actual)
-        norm_expected = TextNormalizer.normalize(expected)
 
         # Check if expected content is substantially in actual
         # (accounts for variations in formatting/structure)
-        if norm_expected in norm_actual:
+        if expected.text in norm_actual:
             return True
 
-        # Calculate similarity (simple approach: matching words)
-        actual_words = set(norm_actual.split())
-        expected_words = set(norm_expected.split())
+        # Calculate similarity (matching words, counted with multiplicity)
+        expected_total = expected.total
 
-        if not expected_words:
+        if not expected_total:
             return False
 
-        matching = len(actual_words & expected_words)
-        similarity = matching / len(expected_words)
-
-        if similarity < tolerance:
-            raise AssertionError(
-                f"Text similarity too low: {similarity:.2%} (expected >= {tolerance:.0%})\n"
-                f"Expected words: {len(expected_words)}\n"
-                f"Matched words: {matching}\n"
-            )
-
-        return True
+        # Consume actual words lazily and stop as soon as tolerance is met
+        remaining = expected.words.copy()
+        needed = tolerance * expected_total
+        matching = 0
+        for match in _WORD.finditer(norm_actual):
+            word = match.group()
+            if remaining[word] > 0:
+                remaining[word] -= 1
+                matching += 1
+                if matching >= needed:
+                    return True
+
+        similarity = matching / expected_total
+        raise AssertionError(
+            f"Text similarity too low: {similarity:.2%} (expected >= {tolerance:.0%})\n"
+            f"Expected words: {expected_total}\n"
+            f"Matched words: {matching}\n"
+        )
+
+
+class GoldenSample:
+    """
+    One sample's prompt, reference and Assistant response, shared by every test of that sample.
+    The response and its visible text are computed on first access.
+    """
+
+    def __init__(
+        self, name: str, prompt: str, expected_rtf: str, expected: NormalizedText,
+        responses: ResponseCache,
+    ):
+        self.name = name
+        self.prompt = prompt
+        self.expected_rtf = expected_rtf
+        self.expected = expected
+        self._responses = responses
+
+    @cached_property
+    def output(self) -> str:
+        """Assistant response to the sample prompt (re-raises the call's error, if any)"""
+        return self._responses(self.prompt)
+
+    @property
+    def rtf_check(self) -> Tuple[bool, str]:
+        """RTF validation result for the response, computed while it streamed in"""
+        return self._responses.rtf_check(self.prompt)
+
+    @property
+    def matches_reference(self) -> bool:
+        """Whether the response is identical to the expected RTF"""
+        return self.output == self.expected_rtf
+
+    @cached_property
+    def visible_text(self) -> str:
+        """Visible text of the response"""
+        return RTFValidator.extract_visible_text(self.output)
 
 
 # ============================================================================
@@ -227,105 +603,294 @@ class TestRTFValidation:
 
     def test_rtf_header_present(self):
         """RTF output must start with RTF header"""
-        validator = RTFValidator()
-        assert validator.is_valid_rtf("{\\rtf1\\ansi test}")[0], "Valid RTF should pass"
+        assert RTFValidator.is_valid_rtf("{\\rtf1\\ansi test}")[0], "Valid RTF should pass"
 
     def test_rtf_unbalanced_braces(self):
         """RTF must have balanced braces"""
-        validator = RTFValidator()
-        is_valid, msg = validator.is_valid_rtf("{\\rtf1\\ansi test")
+        is_valid, msg = RTFValidator.is_valid_rtf("{\\rtf1\\ansi test")
         assert not is_valid, "Should reject unbalanced braces"
         assert "brace" in msg.lower()
 
+    def test_rtf_closing_brace_before_opening(self):
+        """Braces must balance at every point, not just in total"""
+        is_valid, msg = RTFValidator.is_valid_rtf("{\\rtf1\\ansi}}{test}")
+        assert not is_valid, "Should reject a closing brace with no matching opening"
+        assert "brace" in msg.lower()
+
+    def test_rtf_accepts_bytes(self):
+        """Raw RTF bytes validate the same way as text"""
+        assert RTFValidator.is_valid_rtf("{\\rtf1\\ansi Café}".encode("utf-8"))[0], "Valid RTF bytes should pass"
+        assert not RTFValidator.is_valid_rtf(b"{\\rtf1\\ansi test")[0], "Should reject unbalanced braces"
+
+    def test_incremental_validation_matches_full(self):
+        """Validating chunk by chunk must give the same result as validating the whole"""
+        samples = [
+            (EXPECTED_DIR / "sample1_expected.rtf").read_text(encoding="utf-8"),
+            "{\\rtf1\\ansi test",
+            "{\\rtf1\\ansi}}{test}",
+            "  {\\rtf1 no charset}",
+            "{\\rt",
+            "",
+        ]
+        for content in samples:
+            for size in (1, 3, 7, 64):
+                incremental = IncrementalRTFValidator()
+                for start in range(0, len(content), size):
+                    incremental.feed(content[start:start + size])
+                assert incremental.finalize() == RTFValidator.is_valid_rtf(content), (content, size)
+
+    def test_extract_visible_text_negative_parameter(self):
+        """Control words with negative parameters should be stripped whole"""
+        text = RTFValidator.extract_visible_text(r"{\rtf1\ansi {\fi-360\li720 Hello}}")
+        assert text == "Hello"
+
+    def test_extract_visible_text_decodes_escapes(self):
+        """Hex and Unicode escapes should decode to the characters they encode"""
+        text = RTFValidator.extract_visible_text(
+            r"{\rtf1\ansi\uc1 Caf\'e9 na\u239\'efve \u8364? \'a3500}"
+        )
+        assert text == "Café naïve € £500"
+
+        # \uc0: no fallback characters, so the text after \uN must be kept
+        text = RTFValidator.extract_visible_text(r"{\rtf1\ansi\uc0 Caf\u233 s bien}")
+        assert text == "Cafés bien"
+
     def test_rtf_empty_content(self):
         """Empty RTF should be rejected"""
-        validator = RTFValidator()
-        is_valid, msg = validator.is_valid_rtf("")
+        is_valid, msg = RTFValidator.is_valid_rtf("")
         assert not is_valid, "Should reject empty content"
 
 
-@pytest.mark.parametrize("sample", ["sample1", "sample2"])
-class TestGoldenTests:
-    """Golden tests: Compare output against expected reference"""
+class TestTextNormalizer:
+    """Test text normalization and tolerant comparison"""
 
-    def test_rtf_format_validity(self, sample):
-        """Generated RTF must be valid"""
-        with open(INPUT_DIR / f"{sample}.txt") as f:
-            prompt = f.read()
+    def test_normalize_composes_accents(self):
+        """Decomposed and composed accents normalize to the same text"""
+        decomposed = "Cafe\u0301 nai\u0308ve"
+        assert TextNormalizer.normalize(decomposed) == TextNormalizer.normalize("Café naïve")
 
-        output = CustomGPTTester.call_custom_gpt(prompt)
+    def test_normalize_folds_spaces_and_ellipsis(self):
+        """No-break spaces become spaces and the ellipsis becomes three dots"""
+        assert TextNormalizer.normalize("100\u00a0€ \u202fnet\u2026") == "100 € net..."
 
-        # Save output for inspection
-        with open(OUTPUT_DIR / f"{sample}_output.rtf", "w") as f:
-            f.write(output)
+    def test_normalize_folds_quotes_and_dashes(self):
+        """Curly quotes and typographic dashes fold to their ASCII forms"""
+        text = "\u201cOui\u201d \u2018l\u2019\u00e9t\u00e9\u2019 \u2014 2024\u20132025"
+        assert TextNormalizer.normalize(text) == "\"oui\" 'l'été' - 2024-2025"
 
-        validator = RTFValidator()
-        is_valid, msg = validator.is_valid_rtf(output)
-        assert is_valid, f"Invalid RTF output: {msg}"
+    def test_repeated_words_matched_per_occurrence(self):
+        """Each repetition of an expected word needs its own occurrence in the actual text"""
+        assert TextNormalizer.assert_normalized_equal("b a x a a", "a a a b", tolerance=1.0)
+
+        with pytest.raises(AssertionError):
+            # "a" appears once, but the reference has it three times: 2 of 4 words matched
+            TextNormalizer.assert_normalized_equal("a b c d", "a a a b", tolerance=0.85)
+
+    def test_tolerance_reached_exactly(self):
+        """Matching exactly tolerance * expected words is enough"""
+        expected = "one two three four"
+        assert TextNormalizer.assert_normalized_equal("four three two zzz", expected, tolerance=0.75)
+
+        with pytest.raises(AssertionError):
+            TextNormalizer.assert_normalized_equal("four three two zzz", expected, tolerance=0.76)
+
+    def test_similarity_error_reports_totals(self):
+        """The failure message reports the similarity and word totals"""
+        with pytest.raises(AssertionError) as excinfo:
+            TextNormalizer.assert_normalized_equal("one zzz", "one two three four")
+
+        message = str(excinfo.value)
+        assert "Text similarity too low: 25.00% (expected >= 85%)" in message
+        assert "Expected words: 4" in message
+        assert "Matched words: 1" in message
+
+    def test_prepared_expected_matches_raw(self):
+        """A prepared reference compares the same as the raw text"""
+        expected = TextNormalizer.prepare("Rapport  Mensuel - Novembre")
+        assert expected.total == 4
+        assert TextNormalizer.assert_normalized_equal("rapport mensuel - novembre 2025", expected)
+
+
+class TestResponseCache:
+    """Test sharing cached responses between processes (pytest-xdist workers)"""
+
+    def test_dump_load_round_trip(self, tmp_path):
+        """Loaded results behave like the originals, failed calls included"""
+        cache = ResponseCache()
+        cache._results[ResponseCache._key("ok")] = ("{\\rtf1\\ansi Café}", (True, "Valid RTF"))
+        cache._results[ResponseCache._key("ko")] = RuntimeError("API call failed: boom")
+
+        path = tmp_path / "gpt_responses.json"
+        cache.dump(path)
+        loaded = ResponseCache()
+        loaded.load(path)
+
+        for responses in (cache, loaded):
+            assert responses("ok") == "{\\rtf1\\ansi Café}"
+            assert responses.rtf_check("ok") == (True, "Valid RTF")
+            assert isinstance(responses.rtf_check("ok"), tuple)
+            with pytest.raises(RuntimeError, match="API call failed: boom"):
+                responses("ko")
+            with pytest.raises(RuntimeError, match="API call failed: boom"):
+                responses.rtf_check("ko")
+
+    def test_prefetch_shared_fetches_once(self, tmp_path, monkeypatch):
+        """Only the first process fetches; later ones load its results from the shared file"""
+        fetched = []
+
+        def fake_prefetch(self, prompts, save=()):
+            fetched.append(dict(prompts))
+            self._results[ResponseCache._key("ok")] = ("{\\rtf1\\ansi ok}", (True, "Valid RTF"))
+
+        monkeypatch.setattr(ResponseCache, "prefetch", fake_prefetch)
+        path = tmp_path / "gpt_responses.json"
+
+        first, second = ResponseCache(), ResponseCache()
+        first.prefetch_shared({"sample": "ok"}, path)
+        second.prefetch_shared({"sample": "ok"}, path)
+
+        assert fetched == [{"sample": "ok"}]
+        assert second("ok") == first("ok")
+        assert second.rtf_check("ok") == (True, "Valid RTF")
+
+
+class _FakeRunStream:
+    """Stands in for client.beta.threads.runs.stream(): yields chunks, then optionally fails"""
+
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    @property
+    async def text_deltas(self):
+        for chunk in self.chunks:
+            yield chunk
+        if self.error:
+            raise self.error
+
+    async def get_final_run(self):
+        return SimpleNamespace(status="completed")
 
-    def test_content_matches_expected(self, sample):
-        """Output content should match expected reference"""
-        with open(INPUT_DIR / f"{sample}.txt") as f:
-            prompt = f.read()
 
-        with open(EXPECTED_DIR / f"{sample}_expected.rtf") as f:
-            expected = f.read()
+class _FakeAssistantClient:
+    """Offline AsyncOpenAI stand-in: each stream() call consumes the next scripted stream"""
 
-        output = CustomGPTTester.call_custom_gpt(prompt)
+    def __init__(self, streams):
+        self.streams = list(streams)
+        self.threads = []
+        self.runs = []
+        self.beta = SimpleNamespace(threads=SimpleNamespace(
+            create=self._create_thread,
+            messages=SimpleNamespace(create=self._create_message),
+            runs=SimpleNamespace(stream=self._stream),
+        ))
 
-        # Save output
-        with open(OUTPUT_DIR / f"{sample}_output.rtf", "w") as f:
-            f.write(output)
+    async def _create_thread(self):
+        self.threads.append(f"thread_{len(self.threads)}")
+        return SimpleNamespace(id=self.threads[-1])
+
+    async def _create_message(self, thread_id, role, content):
+        return SimpleNamespace(thread_id=thread_id)
 
-        # Extract visible text for comparison
-        validator = RTFValidator()
-        actual_text = validator.extract_visible_text(output)
-        expected_text = validator.extract_visible_text(expected)
+    def _stream(self, thread_id, assistant_id):
+        self.runs.append(thread_id)
+        return self.streams.pop(0)
 
-        # Use normalized comparison
-        TextNormalizer.assert_normalized_equal(actual_text, expected_text)
+
+class TestRetries:
+    """Retrying transient Assistant failures (offline, with a fake client)"""
+
+    RTF = "{\\rtf1\\ansi Hello\\par}"
+
+    @pytest.fixture(autouse=True)
+    def no_backoff(self, monkeypatch):
+        monkeypatch.setattr(_run_assistant.retry, "wait", wait_none())
+
+    def test_dropped_stream_retried_on_new_thread(self):
+        """A stream dropped partway is retried as a whole new attempt, on a new thread"""
+        import httpx
+
+        client = _FakeAssistantClient([
+            _FakeRunStream([self.RTF[:5]], error=httpx.RemoteProtocolError("peer closed connection")),
+            _FakeRunStream([self.RTF[:5], self.RTF[5:]]),
+        ])
+        output, rtf_check = asyncio.run(_run_assistant(client, "prompt"))
+
+        assert output == self.RTF
+        assert rtf_check == (True, "Valid RTF")
+        assert client.runs == ["thread_0", "thread_1"], "Retry must not reuse the first thread"
+
+    def test_stream_error_event_retried(self):
+        """An error event inside the stream is retried"""
+        from openai import APIError
+
+        client = _FakeAssistantClient([
+            _FakeRunStream([], error=APIError("server_error", request=None, body=None)),
+            _FakeRunStream([self.RTF]),
+        ])
+        output, _ = asyncio.run(_run_assistant(client, "prompt"))
+        assert output == self.RTF
+        assert len(client.threads) == 2
+
+    def test_client_error_not_retried(self):
+        """Non-transient failures surface after a single attempt"""
+        client = _FakeAssistantClient([_FakeRunStream([], error=ValueError("bad request"))])
+        with pytest.raises(ValueError):
+            asyncio.run(_run_assistant(client, "prompt"))
+        assert len(client.threads) == 1
+
+
+@pytest.mark.parametrize("sample", ["sample1", "sample2"], indirect=True)
+class TestGoldenTests:
+    """Golden tests: Compare output against expected reference"""
+
+    def test_rtf_format_validity(self, sample):
+        """Generated RTF must be valid"""
+        # Validated while the response streamed in
+        is_valid, msg = sample.rtf_check
+        assert is_valid, f"Invalid RTF output: {msg}"
+
+    def test_content_matches_expected(self, sample):
+        """Output content should match expected reference"""
+        # Identical to the reference RTF: no extraction needed
+        if sample.matches_reference:
+            return
+
+        # Use normalized comparison of the visible text
+        TextNormalizer.assert_normalized_equal(sample.visible_text, sample.expected)
 
     def test_no_rtf_corruption(self, sample):
         """RTF structure must not be corrupted"""
-        with open(INPUT_DIR / f"{sample}.txt") as f:
-            prompt = f.read()
-
-        output = CustomGPTTester.call_custom_gpt(prompt)
+        output = sample.output
 
         # Check for common RTF corruption patterns
+        assert output.lstrip().startswith("{\\rtf"), "Missing RTF declaration"
         assert "\\par" in output or "\\line" in output, "Missing paragraph markers"
-        assert "{\\rtf" in output, "Missing RTF declaration"
-        assert "\\ansicpg" in output or "\\ansicpg" not in output, "Character set OK"  # More flexible
 
 
 class TestRobustness:
     """Robustness tests: Verify stability across variations"""
 
-    @pytest.mark.parametrize(
-        "variation",
-        [
-            "sample1.txt",  # Original
-            "sample1.txt",  # Duplicate to test consistency
-        ],
-    )
-    def test_consistent_output_format(self, variation):
-        """Multiple calls should produce consistent RTF format"""
-        with open(INPUT_DIR / variation) as f:
-            prompt = f.read()
-
-        output = CustomGPTTester.call_custom_gpt(prompt)
+    def test_consistent_output_format(self, input_texts, gpt_response):
+        """Repeated calls with the same prompt should all produce valid RTF"""
+        prompt = input_texts["sample1"]
 
-        validator = RTFValidator()
-        is_valid, msg = validator.is_valid_rtf(output)
-        assert is_valid, f"Inconsistent output format: {msg}"
+        # The cached response, plus fresh calls that bypass the cache
+        for run in range(CONSISTENCY_RUNS):
+            is_valid, msg = gpt_response.rtf_check(prompt, force=run > 0)
+            assert is_valid, f"Inconsistent output format (run {run}): {msg}"
 
-    def test_handles_special_characters(self):
+    def test_handles_special_characters(self, gpt_response):
         """Should handle accented characters and special symbols"""
-        prompt = "Convertir en RTF: Café, naïve, £500, © 2025"
-        output = CustomGPTTester.call_custom_gpt(prompt)
+        output = gpt_response(SPECIAL_CHARACTERS_PROMPT)
 
-        validator = RTFValidator()
-        is_valid, _ = validator.is_valid_rtf(output)
+        is_valid, _ = gpt_response.rtf_check(SPECIAL_CHARACTERS_PROMPT)
         assert is_valid, "Should handle special characters"
 
         # Check that some output was generated
@@ -335,44 +900,21 @@ class TestRobustness:
 class TestIntegration:
     """Integration tests combining multiple aspects"""
 
-    def test_full_pipeline(self):
+    @pytest.mark.parametrize("sample", ["sample1"], indirect=True)
+    def test_full_pipeline(self, sample):
         """Test complete pipeline: input -> API -> validation -> comparison"""
-        sample = "sample1"
-
-        with open(INPUT_DIR / f"{sample}.txt") as f:
-            prompt = f.read()
-
-        with open(EXPECTED_DIR / f"{sample}_expected.rtf") as f:
-            expected = f.read()
-
-        # Call API
-        output = CustomGPTTester.call_custom_gpt(prompt)
-
-        # Validate RTF
-        validator = RTFValidator()
-        is_valid, msg = validator.is_valid_rtf(output)
+        # Validate the API response's RTF (checked while it streamed in)
+        is_valid, msg = sample.rtf_check
         assert is_valid, f"RTF validation failed: {msg}"
 
-        # Extract and compare text
-        actual_text = validator.extract_visible_text(output)
-        expected_text = validator.extract_visible_text(expected)
-
-        TextNormalizer.assert_normalized_equal(actual_text, expected_text, tolerance=0.80)
-
-    def test_report_generation(self):
-        """Generate test report"""
-        report = {
-            "timestamp": __import__("datetime").datetime.now().isoformat(),
-            "model_id": MODEL_ID,
-            "tests_run": 0,
-            "results": {},
-        }
+        # Identical to the reference RTF: no extraction needed
+        if sample.matches_reference:
+            return
 
-        # This would be populated by pytest hooks in a real scenario
-        print("\n" + "=" * 60)
-        print("TEST REPORT")
-        print("=" * 60)
-        print(json.dumps(report, indent=2, ensure_ascii=False))
+        # Extract and compare text
+        TextNormalizer.assert_normalized_equal(
+            sample.visible_text, sample.expected, tolerance=0.80
+        )
 
 
 if __name__ == "__main__":